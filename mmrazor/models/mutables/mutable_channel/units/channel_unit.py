@@ -1,15 +1,20 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-import copy
-from typing import Dict, List
+import sys
+from typing import Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import torch.nn as nn
 from mmengine.model import BaseModule
 
 from mmrazor.models.architectures.dynamic_ops.mixins import DynamicChannelMixin
 from mmrazor.registry import TASK_UTILS
 
+_PLACEHOLDER_NAMES = frozenset({'input_placeholder', 'output_placeholder'})
+_CONFIG_TEMPLATE_ATTRS = frozenset(
+    {'name', 'start', 'end', 'is_output_channel'})
 
-class Channel(BaseModule):
+
+class Channel:
     """Channel records information about channels for pruning.
 
     Args:
@@ -23,6 +28,10 @@ class Channel(BaseModule):
             Defaults to True.
     """
 
+    __slots__ = ('name', 'module', 'index', 'start', 'end', 'node',
+                 'is_output_channel', '_is_mutable', '_is_dynamic',
+                 '_config_template_cache')
+
     # init
 
     def __init__(self,
@@ -31,8 +40,9 @@ class Channel(BaseModule):
                  index,
                  node=None,
                  is_output_channel=True) -> None:
-        super().__init__()
-        self.name = name
+        # names are compared and hashed a lot, interning them makes equal
+        # names share one object.
+        self.name = sys.intern(str(name))
         self.module: nn.Module = module
         self.index = index
         self.start = index[0]
@@ -42,17 +52,46 @@ class Channel(BaseModule):
 
         self.is_output_channel = is_output_channel
 
+        self._is_mutable: Optional[bool] = None
+        self._config_template_cache: Optional[Dict] = None
+
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        # is_mutable depends on the module, which is replaced with a
+        # dynamic op when preparing for pruning.
+        if name in ('name', 'module'):
+            super().__setattr__('_is_mutable', None)
+        if name == 'module':
+            super().__setattr__('_is_dynamic',
+                                isinstance(value, DynamicChannelMixin))
+        if name in _CONFIG_TEMPLATE_ATTRS:
+            super().__setattr__('_config_template_cache', None)
+
     @classmethod
-    def init_from_cfg(cls, model: nn.Module, config: Dict):
+    def init_from_cfg(cls,
+                      model: Optional[nn.Module],
+                      config: Dict,
+                      name2module: Optional[Dict[str, nn.Module]] = None):
         """init a Channel using a config which can be generated by
-        self.config_template()"""
+        self.config_template()
+
+        Args:
+            model (nn.Module, optional): The model the channel belongs to.
+                It is only used when name2module is None.
+            config (Dict): The config of the channel.
+            name2module (Dict[str, nn.Module], optional): A precomputed map
+                from module names to modules of the model. Passing it avoids
+                traversing the model for every channel. Defaults to None.
+        """
         name = config['name']
         start = config['start']
         end = config['end']
         is_output_channel = config['is_output_channel']
 
-        name2module = dict(model.named_modules())
-        name2module.pop('')
+        if name2module is None:
+            assert model is not None
+            name2module = dict(model.named_modules())
+            name2module.pop('')
         module = name2module[name] if name in name2module else None
         return Channel(
             name, module, (start, end), is_output_channel=is_output_channel)
@@ -62,13 +101,14 @@ class Channel(BaseModule):
     def config_template(self):
         """Generate a config template which can be used to initialize a Channel
         by cls.init_from_cfg(**kwargs)"""
-
-        return {
-            'name': str(self.name),
-            'start': self.start,
-            'end': self.end,
-            'is_output_channel': self.is_output_channel
-        }
+        if self._config_template_cache is None:
+            self._config_template_cache = {
+                'name': self.name,
+                'start': self.start,
+                'end': self.end,
+                'is_output_channel': self.is_output_channel
+            }
+        return dict(self._config_template_cache)
 
     # basic properties
 
@@ -77,18 +117,21 @@ class Channel(BaseModule):
         """The number of channels in the Channel."""
         return self.index[1] - self.index[0]
 
+    @property
+    def is_dynamic(self) -> bool:
+        """If the module of the channel is a dynamic op."""
+        return self._is_dynamic
+
     @property
     def is_mutable(self) -> bool:
         """If the channel is prunable."""
-        if self.module is not None:
-            has_prama = len(list(self.module.parameters())) != 0
-            is_dynamic_op = isinstance(self.module, DynamicChannelMixin)
-            return (not has_prama) or is_dynamic_op
-        else:
-            is_unmutable = self.name in [
-                'input_placeholder', 'output_placeholder'
-            ]
-            return not is_unmutable
+        if self._is_mutable is None:
+            if self.module is not None:
+                has_param = next(self.module.parameters(), None) is not None
+                self._is_mutable = (not has_param) or self._is_dynamic
+            else:
+                self._is_mutable = self.name not in _PLACEHOLDER_NAMES
+        return self._is_mutable
 
     def __repr__(self) -> str:
         return (f'{self.__class__.__name__}('
@@ -98,14 +141,25 @@ class Channel(BaseModule):
                 ')')
 
     def __eq__(self, obj: object) -> bool:
-        if isinstance(obj, Channel):
-            return self.name == obj.name \
-                and self.module == obj.module \
-                and self.index == obj.index \
-                and self.is_output_channel == obj.is_output_channel \
-                and self.node == obj.node
-        else:
+        if self is obj:
+            return True
+        if not isinstance(obj, Channel):
             return False
+        # compare the cheapest and most discriminating fields first. Modules
+        # do not override __eq__, so comparing them by identity is the same.
+        return self.index == obj.index \
+            and self.is_output_channel == obj.is_output_channel \
+            and self.name == obj.name \
+            and self.module is obj.module \
+            and (self.node is obj.node or self.node == obj.node)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    @property
+    def _key(self) -> Tuple:
+        """Tuple: The fields identifying the channel in a unit."""
+        return (self.name, self.index, self.is_output_channel)
 
 
 # Channel && ChannelUnit
@@ -128,42 +182,57 @@ class ChannelUnit(BaseModule):
         super().__init__()
 
         self.num_channels = num_channels
-        self.output_related: List[nn.Module] = list()
-        self.input_related: List[nn.Module] = list()
+        self.output_related: List[Channel] = list()
+        self.input_related: List[Channel] = list()
+        # keys of the related channels, used to dedup channels in O(1)
+        self._output_keys: Set[Tuple] = set()
+        self._input_keys: Set[Tuple] = set()
         self.init_args: Dict = {
         }  # is used to generate new channel unit with same args
+        self._name: Optional[str] = None  # set by the name setter
+        self._default_name: Optional[str] = None  # cache of the default name
 
     @classmethod
-    def init_from_cfg(cls, model: nn.Module, config: Dict) -> 'ChannelUnit':
+    def init_from_cfg(
+            cls,
+            model: Optional[nn.Module],
+            config: Dict,
+            name2module: Optional[Dict[str, nn.Module]] = None
+    ) -> 'ChannelUnit':
         """init a ChannelUnit using a config which can be generated by
-        self.config_template()"""
-
-        def auto_fill_channel_config(channel_config: Dict,
-                                     is_output_channel: bool,
-                                     unit_config: Dict = config):
-            """Fill channel config with default values."""
-            if 'start' not in channel_config:
-                channel_config['start'] = 0
-            if 'end' not in channel_config:
-                channel_config['end'] = unit_config['init_args'][
-                    'num_channels']
-            channel_config['is_output_channel'] = is_output_channel
-
-        config = copy.deepcopy(config)
-        if 'channels' in config:
-            channels = config.pop('channels')
-        else:
-            channels = None
+        self.config_template()
+
+        Args:
+            model (nn.Module, optional): The model the unit belongs to. It
+                is only used when the config has channels and name2module
+                is None.
+            config (Dict): The config of the unit.
+            name2module (Dict[str, nn.Module], optional): A precomputed map
+                from module names to modules of the model. It is built from
+                the model when not given. Defaults to None.
+        """
+        config = dict(config)
+        channels = config.pop('channels', None)
         unit = cls(**(config['init_args']))
         if channels is not None:
-            for channel_config in channels['input_related']:
-                auto_fill_channel_config(channel_config, False)
-                unit.add_input_related(
-                    Channel.init_from_cfg(model, channel_config))
-            for channel_config in channels['output_related']:
-                auto_fill_channel_config(channel_config, True)
-                unit.add_output_related(
-                    Channel.init_from_cfg(model, channel_config))
+            if name2module is None:
+                assert model is not None
+                name2module = dict(model.named_modules())
+                name2module.pop('')
+            default_end = config['init_args']['num_channels']
+            for kind, is_output_channel, add_related in (
+                ('input_related', False, unit.add_input_related),
+                ('output_related', True, unit.add_output_related),
+            ):
+                for channel_config in channels[kind]:
+                    # fill channel configs with default values
+                    channel_config = dict(channel_config)
+                    channel_config.setdefault('start', 0)
+                    channel_config.setdefault('end', default_end)
+                    channel_config['is_output_channel'] = is_output_channel
+                    add_related(
+                        Channel.init_from_cfg(model, channel_config,
+                                              name2module))
         return unit
 
     @classmethod
@@ -173,8 +242,11 @@ class ChannelUnit(BaseModule):
         """Initial a object of current class from a ChannelUnit object."""
         args['num_channels'] = unit.num_channels
         mutable_unit = cls(**args)
-        mutable_unit.input_related = unit.input_related
-        mutable_unit.output_related = unit.output_related
+        # add channels one by one to keep the caches of the unit in sync
+        for channel in unit.input_related:
+            mutable_unit.add_input_related(channel)
+        for channel in unit.output_related:
+            mutable_unit.add_output_related(channel)
         return mutable_unit
 
     @classmethod
@@ -187,21 +259,30 @@ class ChannelUnit(BaseModule):
         if isinstance(analyzer, dict):
             analyzer = TASK_UTILS.build(analyzer)
         unit_config = analyzer.analyze(model)
-        return [cls.init_from_cfg(model, cfg) for cfg in unit_config.values()]
+        name2module = dict(model.named_modules())
+        name2module.pop('', None)
+        return [
+            cls.init_from_cfg(model, cfg, name2module)
+            for cfg in unit_config.values()
+        ]
 
     # tools
 
     @property
     def name(self) -> str:
         """str: name of the unit"""
-        if len(self.output_related) + len(self.input_related) > 0:
-            first_module = (list(self.output_related) +
-                            list(self.input_related))[0]
-            first_module_name = f'{first_module.name}_{first_module.index}'
-        else:
-            first_module_name = 'unitx'
-        name = f'{first_module_name}_{self.num_channels}'
-        return getattr(self, '_name', name)
+        if self._name is not None:
+            return self._name
+        if self._default_name is None:
+            channels = self.output_related or self.input_related
+            if channels:
+                first_channel = channels[0]
+                first_channel_name = \
+                    f'{first_channel.name}_{first_channel.index}'
+            else:
+                first_channel_name = 'unitx'
+            self._default_name = f'{first_channel_name}_{self.num_channels}'
+        return self._default_name
 
     @name.setter
     def name(self, unit_name) -> None:
@@ -229,14 +310,41 @@ class ChannelUnit(BaseModule):
     def add_output_related(self, channel: Channel):
         """Add a Channel which is output related."""
         assert channel.is_output_channel
-        if channel not in self.output_related:
+        key = channel._key
+        if key not in self._output_keys:
+            self._output_keys.add(key)
             self.output_related.append(channel)
+            self._default_name = None
 
     def add_input_related(self, channel: Channel):
         """Add a Channel which is input related."""
         assert channel.is_output_channel is False
-        if channel not in self.input_related:
+        key = channel._key
+        if key not in self._input_keys:
+            self._input_keys.add(key)
             self.input_related.append(channel)
+            self._default_name = None
+
+    def mutable_mask(self, kind: str) -> np.ndarray:
+        """Return whether each related channel is prunable.
+
+        Args:
+            kind (str): 'input_related' or 'output_related'.
+
+        Returns:
+            np.ndarray: A bool array aligned with the related channels.
+        """
+        if kind == 'input_related':
+            channels = self.input_related
+        elif kind == 'output_related':
+            channels = self.output_related
+        else:
+            raise ValueError(f'{kind} is not a valid kind of channels, '
+                             'expect input_related or output_related.')
+        # is_mutable is cached by each channel and reset when its module is
+        # replaced, so the mask is always up to date.
+        return np.array([channel.is_mutable for channel in channels],
+                        dtype=bool)
 
     # others
 
@@ -249,10 +357,11 @@ class ChannelUnit(BaseModule):
 
     def _channel_dict(self) -> Dict:
         """Return channel config."""
+        config_template = Channel.config_template
         info = {
             'input_related':
-            [channel.config_template() for channel in self.input_related],
+            [config_template(channel) for channel in self.input_related],
             'output_related':
-            [channel.config_template() for channel in self.output_related],
+            [config_template(channel) for channel in self.output_related],
         }
         return info
@@ -2,7 +2,7 @@
 """This module defines MutableChannelUnit."""
 import abc
 # from collections import set
-from typing import Dict, List, Type, TypeVar
+from typing import Dict, Optional, Type, TypeVar
 
 import torch
 import torch.nn as nn
@@ -43,10 +43,13 @@ class MutableChannelUnit(ChannelUnit):
         super().__init__(num_channels)
 
     @classmethod
-    def init_from_cfg(cls, model: nn.Module, config: Dict):
+    def init_from_cfg(cls,
+                      model: Optional[nn.Module],
+                      config: Dict,
+                      name2module: Optional[Dict[str, nn.Module]] = None):
         """init a Channel using a config which can be generated by
         self.config_template(), include init choice."""
-        unit = super().init_from_cfg(model, config)
+        unit = super().init_from_cfg(model, config, name2module)
         # TO DO: add illegal judgement here?
         if 'choice' in config:
             unit.current_choice = config['choice']
@@ -129,28 +132,12 @@ class MutableChannelUnit(ChannelUnit):
     @property
     def is_mutable(self) -> bool:
         """If the channel-unit is prunable."""
-
-        def traverse(channels: List[Channel]):
-            has_dynamic_op = False
-            all_channel_prunable = True
-            for channel in channels:
-                if channel.is_mutable is False:
-                    all_channel_prunable = False
-                    break
-                if isinstance(channel.module, DynamicChannelMixin):
-                    has_dynamic_op = True
-            return has_dynamic_op, all_channel_prunable
-
-        input_has_dynamic_op, input_all_prunable = traverse(self.input_related)
-        output_has_dynamic_op, output_all_prunable = traverse(
-            self.output_related)
-
         return len(self.output_related) > 0 \
             and len(self.input_related) > 0 \
-            and input_has_dynamic_op \
-            and input_all_prunable \
-            and output_has_dynamic_op \
-            and output_all_prunable
+            and bool(self.mutable_mask('input_related').all()) \
+            and bool(self.mutable_mask('output_related').all()) \
+            and any(channel.is_dynamic for channel in self.input_related) \
+            and any(channel.is_dynamic for channel in self.output_related)
 
     def config_template(self,
                         with_init_args=False,
@@ -103,6 +103,7 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType]):
         device = get_module_device(supernet)
 
         self._name2module = dict(supernet.named_modules())
+        self._name2module.pop('', None)
 
         if isinstance(self.parse_cfg,
                       ChannelAnalyzer) or 'Analyzer' in self.parse_cfg['type']:
@@ -312,7 +313,7 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType]):
 
         # get ChannelUnits
         units = [
-            ChannelUnit.init_from_cfg(model, cfg)
+            ChannelUnit.init_from_cfg(model, cfg, self._name2module)
             for cfg in unit_configs.values()
         ]
         # convert to MutableChannelUnits
@@ -340,12 +341,14 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType]):
                 init_args.update(config[unit_key]['init_args'])
             config[unit_key]['init_args'] = init_args
             if 'channels' in config[unit_key]:
-                unit = self.unit_class.init_from_cfg(model, config[unit_key])
+                unit = self.unit_class.init_from_cfg(
+                    model, config[unit_key], self._name2module)
                 unit.name = unit_key
             else:
                 try:
                     unit = self._prepare_unit_from_init_cfg(
-                        model, config[unit_key], unit_configs[unit_key])
+                        model, config[unit_key], unit_configs[unit_key],
+                        self._name2module)
                 except ValueError:
                     raise ValueError(
                         'Initializing channel_mutator from the config needs'
@@ -353,10 +356,14 @@ class ChannelMutator(BaseMutator, Generic[ChannelUnitType]):
             units.append(unit)
         return units
 
-    def _prepare_unit_from_init_cfg(self, model: Module, channel_cfg: dict,
-                                    init_cfg: dict):
+    def _prepare_unit_from_init_cfg(
+            self,
+            model: Module,
+            channel_cfg: dict,
+            init_cfg: dict,
+            name2module: Optional[Dict[str, Module]] = None):
         """Initialize units using the init_cfg, which created by tracer."""
-        unit = ChannelUnit.init_from_cfg(model, init_cfg)
+        unit = ChannelUnit.init_from_cfg(model, init_cfg, name2module)
         unit = self._convert_channel_unit_to_mutable([unit])[0]
         if 'choice' in channel_cfg:
             unit.current_choice = channel_cfg['choice']
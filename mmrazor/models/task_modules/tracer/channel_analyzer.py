@@ -140,8 +140,10 @@ class ChannelAnalyzer:
     def _find_mutable_units(self, model: nn.Module, units_config: Dict):
         """Test the tracer result and filter unforwardable units."""
         model = copy.deepcopy(model).cpu()
+        name2module = dict(model.named_modules())
+        name2module.pop('', None)
         units: List[SequentialMutableChannelUnit] = [
-            SequentialMutableChannelUnit.init_from_cfg(model, cfg)
+            SequentialMutableChannelUnit.init_from_cfg(model, cfg, name2module)
             for cfg in units_config.values()
         ]
         for unit in units:
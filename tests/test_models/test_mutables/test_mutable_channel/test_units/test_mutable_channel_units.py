@@ -1,15 +1,18 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import copy
 from typing import List
 from unittest import TestCase
 
 import torch
 import torch.nn as nn
 
+from mmrazor.models.architectures.dynamic_ops import DynamicConv2d
 from mmrazor.models.architectures.dynamic_ops.mixins import DynamicChannelMixin
 from mmrazor.models.mutables.mutable_channel import (
-    L1MutableChannelUnit, MutableChannelUnit, SequentialMutableChannelUnit)
-from mmrazor.models.mutables.mutable_channel.units.channel_unit import \
-    ChannelUnit
+    L1MutableChannelUnit, MutableChannelUnit, OneShotMutableChannelUnit,
+    SequentialMutableChannelUnit)
+from mmrazor.models.mutables.mutable_channel.units.channel_unit import (
+    Channel, ChannelUnit)
 from .....data.models import SingleLineModel
 from .....data.tracer_passed_models import backward_passed_library
 
@@ -138,3 +141,160 @@ class TestMutableChannelUnit(TestCase):
                         if isinstance(module, nn.BatchNorm2d):
                             self.assertTrue(
                                 isinstance(module, DynamicChannelMixin))
+
+
+class TestChannel(TestCase):
+
+    def test_is_mutable(self):
+        conv = nn.Conv2d(3, 8, 3)
+        channel = Channel('conv', conv, (0, 8))
+        self.assertFalse(channel.is_mutable)
+
+        # the cached value is refreshed when the module is replaced
+        channel.module = DynamicConv2d.convert_from(conv)
+        self.assertTrue(channel.is_mutable)
+
+        channel = Channel('input_placeholder', None, (0, 3))
+        self.assertFalse(channel.is_mutable)
+        channel = Channel('cat_1', None, (0, 3))
+        self.assertTrue(channel.is_mutable)
+
+    def test_eq_and_hash(self):
+        conv = nn.Conv2d(3, 8, 3)
+        node = object()
+        channel = Channel('conv', conv, (0, 8), node=node)
+        same = Channel('conv', conv, (0, 8), node=node)
+        self.assertIsNot(channel, same)
+        self.assertEqual(channel, same)
+        self.assertEqual(hash(channel), hash(same))
+        self.assertEqual(len({channel, same}), 1)
+
+        self.assertNotEqual(channel,
+                            Channel('conv', nn.Conv2d(3, 8, 3), (0, 8),
+                                    node=node))
+        self.assertNotEqual(channel,
+                            Channel('conv', conv, (0, 8), node=object()))
+        self.assertNotEqual(channel, Channel('conv', conv, (0, 4), node=node))
+        self.assertNotEqual(
+            channel,
+            Channel('conv', conv, (0, 8), node=node, is_output_channel=False))
+        self.assertNotEqual(channel, 'conv')
+
+    def test_config_template(self):
+        channel = Channel('conv', nn.Conv2d(3, 8, 3), (0, 8))
+        config = channel.config_template()
+        self.assertDictEqual(config, {
+            'name': 'conv',
+            'start': 0,
+            'end': 8,
+            'is_output_channel': True
+        })
+        # the returned config is a copy of the cached one
+        config['end'] = 4
+        self.assertEqual(channel.config_template()['end'], 8)
+
+        channel.end = 4
+        self.assertEqual(channel.config_template()['end'], 4)
+
+
+class TestChannelUnit(TestCase):
+
+    def test_add_related(self):
+        conv = nn.Conv2d(3, 8, 3)
+        unit = ChannelUnit(8)
+        unit.add_output_related(Channel('conv', conv, (0, 8)))
+        unit.add_output_related(Channel('conv', conv, (0, 8)))
+        unit.add_output_related(Channel('conv', conv, (0, 4)))
+        self.assertEqual(len(unit.output_related), 2)
+
+        unit.add_input_related(
+            Channel('conv', conv, (0, 8), is_output_channel=False))
+        unit.add_input_related(
+            Channel('conv', conv, (0, 8), is_output_channel=False))
+        self.assertEqual(len(unit.input_related), 1)
+
+    def test_mutable_mask(self):
+        unit = ChannelUnit(8)
+        unit.add_output_related(Channel('conv', nn.Conv2d(3, 8, 3), (0, 8)))
+        unit.add_output_related(Channel('relu', nn.ReLU(), (0, 8)))
+        unit.add_input_related(
+            Channel('output_placeholder', None, (0, 8), False))
+        self.assertListEqual(
+            unit.mutable_mask('output_related').tolist(), [False, True])
+        self.assertListEqual(
+            unit.mutable_mask('input_related').tolist(), [False])
+        with self.assertRaises(ValueError):
+            unit.mutable_mask('related')
+
+        # the masks of a converted unit stay aligned with its channels
+        new_unit = ChannelUnit.init_from_channel_unit(unit)
+        new_unit.add_output_related(
+            Channel('conv2', DynamicConv2d(8, 8, 3), (0, 8)))
+        self.assertListEqual(
+            new_unit.mutable_mask('output_related').tolist(),
+            [False, True, True])
+        self.assertEqual(len(unit.output_related), 2)
+        self.assertEqual(len(unit.mutable_mask('output_related')), 2)
+
+        # the masks follow modules replaced outside of the unit
+        conv_channel = new_unit.output_related[0]
+        conv_channel.module = DynamicConv2d.convert_from(conv_channel.module)
+        self.assertListEqual(
+            new_unit.mutable_mask('output_related').tolist(),
+            [True, True, True])
+
+    def test_name(self):
+        conv = nn.Conv2d(3, 8, 3)
+        unit = ChannelUnit(8)
+        self.assertEqual(unit.name, 'unitx_8')
+        unit.add_input_related(Channel('conv', conv, (0, 3), False))
+        self.assertEqual(unit.name, 'conv_(0, 3)_8')
+        unit.add_output_related(Channel('conv', conv, (0, 8)))
+        self.assertEqual(unit.name, 'conv_(0, 8)_8')
+        unit.name = 'unit_0'
+        self.assertEqual(unit.name, 'unit_0')
+
+    def test_name_after_init_from_channel_unit(self):
+        conv = nn.Conv2d(3, 9, 3)
+        unit = ChannelUnit(9)
+        unit.add_output_related(Channel('conv', conv, (0, 9)))
+        # 0.5 is not divisible for 9 channels, so the constructor logs the
+        # name of the unit before its channels are added.
+        mutable_unit = OneShotMutableChannelUnit.init_from_channel_unit(
+            unit, dict(candidate_choices=[0.5, 1.0]))
+        self.assertEqual(mutable_unit.name, unit.name)
+        self.assertEqual(mutable_unit.name, 'conv_(0, 9)_9')
+
+    def test_init_from_cfg_without_channels(self):
+        # the model is not needed when the config has no channels
+        unit = ChannelUnit.init_from_cfg(
+            None, ChannelUnit(8).config_template(with_init_args=True))
+        self.assertEqual(unit.num_channels, 8)
+        self.assertEqual(len(unit.output_related), 0)
+        self.assertEqual(len(unit.input_related), 0)
+
+    def test_init_from_cfg_keeps_config(self):
+        model = nn.Sequential(nn.Conv2d(3, 8, 3), nn.BatchNorm2d(8))
+        config = {
+            'init_args': {
+                'num_channels': 8
+            },
+            'channels': {
+                'input_related': [{
+                    'name': '1'
+                }],
+                'output_related': [{
+                    'name': '0',
+                    'start': 0
+                }, {
+                    'name': '1',
+                    'end': 8
+                }]
+            }
+        }
+        config_copy = copy.deepcopy(config)
+        unit = ChannelUnit.init_from_cfg(model, config)
+        self.assertDictEqual(config, config_copy)
+        self.assertEqual(len(unit.output_related), 2)
+        self.assertEqual(unit.input_related[0].index, (0, 8))
+        self.assertFalse(unit.input_related[0].is_output_channel)